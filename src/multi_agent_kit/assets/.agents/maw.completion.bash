@@ -5,7 +5,7 @@ _maw_complete() {
   local cur prev words cword
   _init_completion || return
 
-  local subcommands="attach agents catlab direnv help hey install kill remove send setup start uninstall version warp zoom"
+  local subcommands="attach agents catlab direnv help hey install kill remove restore send setup snapshot start uninstall version warp zoom"
 
   if [[ $cword -eq 1 ]]; then
     # Complete main subcommands
@@ -65,6 +65,16 @@ _maw_complete() {
       fi
       return 0
       ;;
+    snapshot)
+      local flags="--prefix --session --scrollback --help -h"
+      COMPREPLY=($(compgen -W "$flags" -- "$cur"))
+      return 0
+      ;;
+    restore)
+      local flags="--prefix --session --no-commands --force -f --detach -d --list -l --help -h"
+      COMPREPLY=($(compgen -W "$flags" -- "$cur"))
+      return 0
+      ;;
     remove|uninstall)
       # Complete with common flags
       local flags="--dry-run -n --force -f --help -h"
@@ -42,6 +42,8 @@ Commands:
   install | setup    Run setup.sh to provision or refresh agent worktrees
   start              Run start-agents.sh to launch the tmux session
   attach             Run attach.sh to connect to an active tmux session
+  snapshot           Run snapshot.sh to save the session layout and pane state
+  restore            Run restore.sh to rebuild a session from its snapshot
   agents             Run agents.sh to manage worktrees manually
   kill               Run kill-all.sh to terminate tmux sessions by prefix
   send               Run send-commands.sh to broadcast commands to panes
@@ -142,6 +144,12 @@ maw() {
     attach)
       __maw_exec attach.sh "$@"
       ;;
+    snapshot)
+      __maw_exec snapshot.sh "$@"
+      ;;
+    restore)
+      __maw_exec restore.sh "$@"
+      ;;
     agents)
       __maw_exec agents.sh "$@"
       ;;
@@ -191,6 +199,8 @@ maw() {
 
 alias maw-start='maw start'
 alias maw-attach='maw attach'
+alias maw-snapshot='maw snapshot'
+alias maw-restore='maw restore'
 alias maw-setup='maw install'
 alias maw-agents='maw agents'
 alias maw-kill='maw kill'
@@ -0,0 +1,299 @@
+#!/bin/bash
+# Rebuild an agent tmux session from a snapshot taken by snapshot.sh
+
+set -euo pipefail
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+AGENT_ROOT=$(cd "$SCRIPT_DIR/.." && pwd)
+REPO_ROOT=$(cd "$AGENT_ROOT/.." && pwd)
+AGENTS_DIR="$REPO_ROOT/agents"
+SNAPSHOT_DIR="$AGENT_ROOT/snapshots"
+DEFAULT_TMUX_CONF="$AGENT_ROOT/config/tmux.conf"
+
+BASE_PREFIX=${SESSION_PREFIX:-ai}
+DIR_NAME=$(basename "$REPO_ROOT")
+
+CUSTOM_PREFIX=""
+SESSION_OVERRIDE=""
+DETACHED=false
+FORCE=false
+RUN_COMMANDS=true
+
+usage() {
+    cat <<'USAGE'
+Usage: restore.sh [--prefix <prefix>] [--session <name>] [options]
+       restore.sh --list
+
+Recreate a tmux session from .agents/snapshots/<session>.snapshot. Windows,
+panes, layout, working directories and (if captured) scrollback are rebuilt in
+a single batched tmux call; saved pane commands are then relaunched in a
+second one. No setup, direnv or warp steps are re-run.
+
+Options:
+  --prefix <prefix>   Restore session <prefix>-ai-<repo>
+  --session <name>    Restore a specific tmux session name
+  --no-commands       Do not relaunch the commands panes were running
+  --force, -f         Replace the session if it is already running
+  --detach, -d        Do not attach after restoring
+  --list              List available snapshots
+USAGE
+}
+
+list_snapshots() {
+    echo "📋 Available snapshots:"
+    local found=false
+    local file
+    for file in "$SNAPSHOT_DIR"/*.snapshot; do
+        [[ -f "$file" ]] || continue
+        found=true
+        local name
+        name=$(basename "$file" .snapshot)
+        local panes
+        panes=$(grep -c '^pane' "$file" || true)
+        echo "  - $name ($panes panes)"
+    done
+    if [[ "$found" = false ]]; then
+        echo "  (no snapshots found — create one with 'maw snapshot')"
+    fi
+}
+
+while [[ $# -gt 0 ]]; do
+    case $1 in
+        --prefix)
+            CUSTOM_PREFIX="$2"
+            shift 2
+            ;;
+        --session)
+            SESSION_OVERRIDE="$2"
+            shift 2
+            ;;
+        --no-commands)
+            RUN_COMMANDS=false
+            shift
+            ;;
+        --force|-f)
+            FORCE=true
+            shift
+            ;;
+        --detach|-d)
+            DETACHED=true
+            shift
+            ;;
+        --list|-l)
+            list_snapshots
+            exit 0
+            ;;
+        -h|--help)
+            usage
+            exit 0
+            ;;
+        *)
+            echo "Unknown option: $1" >&2
+            usage >&2
+            exit 1
+            ;;
+    esac
+done
+
+if [[ -n "$SESSION_OVERRIDE" ]]; then
+    SESSION_NAME="$SESSION_OVERRIDE"
+elif [[ -n "$CUSTOM_PREFIX" ]]; then
+    SESSION_NAME="$CUSTOM_PREFIX-$BASE_PREFIX-$DIR_NAME"
+else
+    SESSION_NAME="$BASE_PREFIX-$DIR_NAME"
+fi
+
+if ! command -v tmux >/dev/null 2>&1; then
+    echo "tmux not found in PATH. Install tmux to restore agent sessions." >&2
+    exit 1
+fi
+
+SNAPSHOT_FILE="$SNAPSHOT_DIR/$SESSION_NAME.snapshot"
+SCROLLBACK_DIR="$SNAPSHOT_DIR/$SESSION_NAME"
+
+if [[ ! -f "$SNAPSHOT_FILE" ]]; then
+    echo "❌ No snapshot found for session: $SESSION_NAME" >&2
+    list_snapshots >&2
+    exit 1
+fi
+
+if tmux has-session -t "$SESSION_NAME" 2>/dev/null; then
+    if [[ "$FORCE" = true ]]; then
+        echo "🗑️  Replacing running session: $SESSION_NAME"
+        tmux kill-session -t "$SESSION_NAME"
+    else
+        echo "ℹ️ Session '$SESSION_NAME' is already running" >&2
+        echo "💡 Attach with 'maw attach' or rerun with --force to replace it" >&2
+        exit 1
+    fi
+fi
+
+declare -a WINDOW_ACTIVE=() WINDOW_WIDTH=() WINDOW_HEIGHT=() WINDOW_LAYOUT=()
+declare -a PANE_WINDOW=() PANE_ACTIVE=() PANE_AGENT=() PANE_CWD=() PANE_SCROLLBACK=() PANE_COMMAND=()
+
+while IFS=$'\t' read -r kind f1 f2 f3 f4 f5; do
+    case "$kind" in
+        window)
+            WINDOW_ACTIVE+=("$f1")
+            WINDOW_WIDTH+=("$f2")
+            WINDOW_HEIGHT+=("$f3")
+            WINDOW_LAYOUT+=("$f4")
+            ;;
+        pane)
+            PANE_WINDOW+=($((${#WINDOW_LAYOUT[@]} - 1)))
+            PANE_ACTIVE+=("$f1")
+            PANE_AGENT+=("$f2")
+            PANE_CWD+=("$f3")
+            PANE_SCROLLBACK+=("$f4")
+            PANE_COMMAND+=("$f5")
+            ;;
+    esac
+done <"$SNAPSHOT_FILE"
+
+if [[ ${#PANE_CWD[@]} -eq 0 ]]; then
+    echo "❌ Snapshot contains no panes: ${SNAPSHOT_FILE#"$REPO_ROOT/"}" >&2
+    exit 1
+fi
+
+# Prefer the recorded cwd, then the pane's agent worktree, then the repo root
+resolve_cwd() {
+    local cwd=$1
+    local agent=$2
+    if [[ -d "$cwd" ]]; then
+        printf '%s' "$cwd"
+    elif [[ "$agent" != "-" ]] && [[ "$agent" != "root" ]] && [[ -d "$AGENTS_DIR/$agent" ]]; then
+        printf '%s' "$AGENTS_DIR/$agent"
+    else
+        printf '%s' "$REPO_ROOT"
+    fi
+}
+
+# Replay saved scrollback before handing the pane over to a login shell
+pane_shell_command() {
+    local scrollback=$1
+    [[ "$scrollback" != "-" ]] || return 0
+    local log_file="$SCROLLBACK_DIR/$scrollback"
+    [[ -f "$log_file" ]] || return 0
+    # Expanded here: tmux runs this with default-shell -c, which may be fish
+    printf 'cat %q; exec %q -l' "$log_file" "${SHELL:-/bin/sh}"
+}
+
+# Every step is appended to one tmux invocation, separated by ';'
+declare -a TMUX_BATCH=()
+batch() {
+    if [[ ${#TMUX_BATCH[@]} -gt 0 ]]; then
+        TMUX_BATCH+=(";")
+    fi
+    TMUX_BATCH+=("$@")
+}
+
+ACTIVE_WINDOW_OFFSET=0
+pane=0
+for window in "${!WINDOW_LAYOUT[@]}"; do
+    position=0
+    active_position=0
+    while [[ $pane -lt ${#PANE_CWD[@]} ]] && [[ "${PANE_WINDOW[$pane]}" -eq "$window" ]]; do
+        cwd=$(resolve_cwd "${PANE_CWD[$pane]}" "${PANE_AGENT[$pane]}")
+        shell_command=$(pane_shell_command "${PANE_SCROLLBACK[$pane]}")
+
+        declare -a create=()
+        if [[ $position -gt 0 ]]; then
+            create=(split-window -t "$SESSION_NAME:" -c "$cwd")
+        elif [[ $window -eq 0 ]]; then
+            create=(new-session -d -s "$SESSION_NAME" -c "$cwd"
+                -x "${WINDOW_WIDTH[$window]}" -y "${WINDOW_HEIGHT[$window]}")
+        else
+            create=(new-window -t "$SESSION_NAME:" -c "$cwd")
+        fi
+        if [[ -n "$shell_command" ]]; then
+            create+=("$shell_command")
+        fi
+        batch "${create[@]}"
+
+        # Keep panes evenly sized so the next split always has room
+        if [[ $position -gt 0 ]]; then
+            batch select-layout -t "$SESSION_NAME:" tiled
+        fi
+
+        if [[ "${PANE_ACTIVE[$pane]}" = "1" ]]; then
+            active_position=$position
+        fi
+        position=$((position + 1))
+        pane=$((pane + 1))
+    done
+
+    if [[ $position -eq 0 ]]; then
+        continue
+    fi
+
+    batch select-layout -t "$SESSION_NAME:" "${WINDOW_LAYOUT[$window]}"
+    # The last pane created is active; step forward (wrapping) to the saved one
+    batch select-pane -t "$SESSION_NAME:.+$((active_position + 1))"
+
+    if [[ "${WINDOW_ACTIVE[$window]}" = "1" ]]; then
+        ACTIVE_WINDOW_OFFSET=$window
+    fi
+done
+
+batch select-window -t "$SESSION_NAME:{start}"
+for ((step = 0; step < ACTIVE_WINDOW_OFFSET; step++)); do
+    batch next-window -t "$SESSION_NAME"
+done
+
+echo "♻️  Restoring ${#PANE_CWD[@]} panes into session: $SESSION_NAME"
+tmux "${TMUX_BATCH[@]}"
+
+# Relaunch commands once shells have drawn a prompt; typeahead sent while a
+# shell is still initialising can be discarded
+if [[ "$RUN_COMMANDS" = true ]]; then
+    declare -a PANE_IDS=()
+    while IFS= read -r pane_id; do
+        PANE_IDS+=("$pane_id")
+    done < <(tmux list-panes -s -t "$SESSION_NAME" -F "#{pane_id}")
+    declare -a PENDING=()
+    for pane in "${!PANE_COMMAND[@]}"; do
+        if [[ "${PANE_COMMAND[$pane]}" != "-" ]] && [[ -n "${PANE_IDS[$pane]:-}" ]]; then
+            PENDING+=("$pane")
+        fi
+    done
+
+    if [[ ${#PENDING[@]} -gt 0 ]]; then
+        for ((attempt = 0; attempt < 50; attempt++)); do
+            ready=true
+            for pane in "${PENDING[@]}"; do
+                if [[ $(tmux display-message -p -t "${PANE_IDS[$pane]}" "#{cursor_x}") -eq 0 ]]; then
+                    ready=false
+                    break
+                fi
+            done
+            [[ "$ready" = true ]] && break
+            sleep 0.1
+        done
+
+        TMUX_BATCH=()
+        for pane in "${PENDING[@]}"; do
+            batch send-keys -t "${PANE_IDS[$pane]}" -l "${PANE_COMMAND[$pane]}"
+            batch send-keys -t "${PANE_IDS[$pane]}" Enter
+        done
+        echo "🚀 Relaunching ${#PENDING[@]} pane command(s)"
+        tmux "${TMUX_BATCH[@]}"
+    fi
+fi
+
+if [ -n "${TMUX_CONF:-}" ] && [ -f "$TMUX_CONF" ]; then
+    tmux source-file "$TMUX_CONF" 2>/dev/null || true
+elif [ -f "$DEFAULT_TMUX_CONF" ]; then
+    tmux source-file "$DEFAULT_TMUX_CONF" 2>/dev/null || true
+elif [ -f "$REPO_ROOT/.tmux.conf" ]; then
+    tmux source-file "$REPO_ROOT/.tmux.conf" 2>/dev/null || true
+fi
+
+echo "✅ Restored session from ${SNAPSHOT_FILE#"$REPO_ROOT/"}"
+
+if [ "$DETACHED" = true ]; then
+    echo "📌 Running in detached mode"
+    echo "💡 Attach with: tmux attach-session -t $SESSION_NAME"
+else
+    echo "📍 Attaching to session..."
+    exec tmux attach-session -t "$SESSION_NAME"
+fi
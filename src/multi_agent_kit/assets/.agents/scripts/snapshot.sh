@@ -0,0 +1,256 @@
+#!/bin/bash
+# Record the layout and pane state of a running agent tmux session
+
+set -euo pipefail
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+AGENT_ROOT=$(cd "$SCRIPT_DIR/.." && pwd)
+REPO_ROOT=$(cd "$AGENT_ROOT/.." && pwd)
+AGENTS_DIR="$REPO_ROOT/agents"
+SNAPSHOT_DIR="$AGENT_ROOT/snapshots"
+
+BASE_PREFIX=${SESSION_PREFIX:-ai}
+DIR_NAME=$(basename "$REPO_ROOT")
+
+CUSTOM_PREFIX=""
+SESSION_OVERRIDE=""
+SCROLLBACK_LINES=0
+
+usage() {
+    cat <<'USAGE'
+Usage: snapshot.sh [--prefix <prefix>] [--session <name>] [--scrollback <lines>]
+
+Save the running tmux session (layout, pane → agent mapping, pane cwd and
+running command) to .agents/snapshots/<session>.snapshot so it can be
+rebuilt later with restore.sh.
+
+Options:
+  --prefix <prefix>      Snapshot session <prefix>-ai-<repo>
+  --session <name>       Snapshot a specific tmux session name
+  --scrollback <lines>   Also save the last <lines> lines of each pane
+USAGE
+}
+
+while [[ $# -gt 0 ]]; do
+    case $1 in
+        --prefix)
+            CUSTOM_PREFIX="$2"
+            shift 2
+            ;;
+        --session)
+            SESSION_OVERRIDE="$2"
+            shift 2
+            ;;
+        --scrollback)
+            SCROLLBACK_LINES="$2"
+            shift 2
+            ;;
+        -h|--help)
+            usage
+            exit 0
+            ;;
+        *)
+            echo "Unknown option: $1" >&2
+            usage >&2
+            exit 1
+            ;;
+    esac
+done
+
+if [[ ! "$SCROLLBACK_LINES" =~ ^[0-9]+$ ]]; then
+    echo "❌ --scrollback expects a number of lines, got: $SCROLLBACK_LINES" >&2
+    exit 1
+fi
+
+if [[ -n "$SESSION_OVERRIDE" ]]; then
+    SESSION_NAME="$SESSION_OVERRIDE"
+elif [[ -n "$CUSTOM_PREFIX" ]]; then
+    SESSION_NAME="$CUSTOM_PREFIX-$BASE_PREFIX-$DIR_NAME"
+else
+    SESSION_NAME="$BASE_PREFIX-$DIR_NAME"
+fi
+
+if ! command -v tmux >/dev/null 2>&1; then
+    echo "tmux not found in PATH. Install tmux to snapshot agent sessions." >&2
+    exit 1
+fi
+
+if ! tmux has-session -t "$SESSION_NAME" 2>/dev/null; then
+    echo "❌ tmux session not found: $SESSION_NAME" >&2
+    echo "Available sessions:" >&2
+    tmux list-sessions -F "  #{session_name}" 2>/dev/null || true
+    exit 1
+fi
+
+# Fields are tab-separated, so strip tabs and newlines from free-form values
+clean_field() {
+    local value=${1//$'\t'/ }
+    value=${value//$'\n'/ }
+    printf '%s' "${value:--}"
+}
+
+pane_agent() {
+    local cwd=$1
+    if [[ "$cwd" == "$REPO_ROOT" ]]; then
+        printf 'root'
+    elif [[ "$cwd" == "$AGENTS_DIR/"* ]]; then
+        local rel=${cwd#"$AGENTS_DIR/"}
+        printf '%s' "${rel%%/*}"
+    else
+        printf -- '-'
+    fi
+}
+
+# Leader of the pane's foreground process group: the job tmux reports as
+# pane_current_command, not whichever child of the shell has the lowest pid
+pane_foreground_pid() {
+    local pane_pid=$1
+    local current=$2
+
+    local tpgid
+    tpgid=$(ps -o tpgid= -p "$pane_pid" 2>/dev/null | tr -d ' ' || true)
+    if [[ "$tpgid" =~ ^[0-9]+$ ]] && [[ "$tpgid" -gt 0 ]] && ps -p "$tpgid" >/dev/null 2>&1; then
+        printf '%s' "$tpgid"
+        return
+    fi
+
+    local child
+    for child in $(pgrep -P "$pane_pid" 2>/dev/null || true); do
+        if [[ "$(ps -o comm= -p "$child" 2>/dev/null || true)" == "$current" ]]; then
+            printf '%s' "$child"
+            return
+        fi
+    done
+}
+
+# Command line of whatever the pane is running, quoted so it can be retyped
+# into a shell verbatim; empty for an idle shell or when it cannot be
+# recovered safely.
+pane_command() {
+    local pane_pid=$1
+    local current=$2
+
+    case "${current#-}" in
+        bash|zsh|fish|sh|dash|ksh|mksh|tcsh|csh)
+            return
+            ;;
+    esac
+
+    local pid
+    pid=$(pane_foreground_pid "$pane_pid" "$current")
+
+    if [[ -n "$pid" ]] && [[ -r "/proc/$pid/cmdline" ]]; then
+        local -a argv=()
+        local arg
+        while IFS= read -r -d '' arg; do
+            argv+=("$arg")
+        done <"/proc/$pid/cmdline"
+
+        # Processes that set their title (e.g. Node CLIs via process.title)
+        # overwrite argv and pad it with NULs; only the name is left to save
+        local rewritten=false
+        if [[ ${#argv[@]} -gt 0 ]] && [[ -z "${argv[${#argv[@]} - 1]}" ]]; then
+            rewritten=true
+        elif [[ ${#argv[@]} -eq 1 ]] && [[ "${argv[0]}" == *" "* ]]; then
+            rewritten=true
+        fi
+
+        if [[ ${#argv[@]} -eq 0 ]] || [[ "$rewritten" = true ]]; then
+            printf '%q' "$current"
+            return
+        fi
+
+        local escaped quoted=""
+        for arg in "${argv[@]}"; do
+            printf -v escaped '%q' "$arg"
+            quoted+="$escaped "
+        done
+        printf '%s' "${quoted% }"
+        return
+    fi
+
+    # Without /proc (e.g. macOS) ps joins argv with spaces and loses quoting,
+    # so only relaunch commands that were started without arguments
+    local args
+    args=$(ps -ww -o args= -p "${pid:-$pane_pid}" 2>/dev/null || true)
+    args=${args%"${args##*[![:space:]]}"}
+    if [[ -n "$args" ]] && [[ "$args" != *[[:space:]]* ]]; then
+        printf '%q' "$args"
+    fi
+}
+
+# Drop the empty rows below the cursor so restore does not replay a screen
+# of blank lines before the prompt
+trim_trailing_blank_lines() {
+    awk '/^[[:space:]]*$/ { blank[++n] = $0; next }
+         { for (i = 1; i <= n; i++) print blank[i]; n = 0; print }'
+}
+
+mkdir -p "$SNAPSHOT_DIR"
+SNAPSHOT_FILE="$SNAPSHOT_DIR/$SESSION_NAME.snapshot"
+SCROLLBACK_DIR="$SNAPSHOT_DIR/$SESSION_NAME"
+
+# Write everything to temporary paths and only replace the previous snapshot
+# once the capture is known to be good
+TMP_FILE=$(mktemp "$SNAPSHOT_DIR/.snapshot.XXXXXX")
+TMP_SCROLLBACK_DIR=$(mktemp -d "$SNAPSHOT_DIR/.scrollback.XXXXXX")
+trap 'rm -rf "$TMP_FILE" "$TMP_SCROLLBACK_DIR"' EXIT
+
+{
+    printf '# maw snapshot v1\n'
+    printf 'session\t%s\n' "$SESSION_NAME"
+} >"$TMP_FILE"
+
+WINDOW_COUNT=0
+PANE_COUNT=0
+# tmux -u: without a UTF-8 locale (cron, systemd) tmux rewrites the tab
+# separators in -F output as '_'
+while IFS=$'\t' read -r window_index window_active window_width window_height window_layout; do
+    if [[ ! "$window_index" =~ ^[0-9]+$ ]] || [[ -z "$window_layout" ]]; then
+        echo "❌ Could not parse tmux window list for '$SESSION_NAME'; previous snapshot kept" >&2
+        exit 1
+    fi
+    WINDOW_COUNT=$((WINDOW_COUNT + 1))
+    printf 'window\t%s\t%s\t%s\t%s\n' \
+        "$window_active" "$window_width" "$window_height" "$window_layout" >>"$TMP_FILE"
+
+    while IFS=$'\t' read -r pane_index pane_active pane_pid pane_current_command pane_cwd; do
+        if [[ ! "$pane_pid" =~ ^[0-9]+$ ]]; then
+            echo "❌ Could not parse tmux pane list for '$SESSION_NAME'; previous snapshot kept" >&2
+            exit 1
+        fi
+        PANE_COUNT=$((PANE_COUNT + 1))
+        agent=$(pane_agent "$pane_cwd")
+        command_line=$(pane_command "$pane_pid" "$pane_current_command")
+
+        scrollback="-"
+        if [[ "$SCROLLBACK_LINES" -gt 0 ]]; then
+            scrollback="$window_index.$pane_index.log"
+            tmux capture-pane -p -J -S "-$SCROLLBACK_LINES" -t "$SESSION_NAME:$window_index.$pane_index" \
+                | trim_trailing_blank_lines >"$TMP_SCROLLBACK_DIR/$scrollback"
+        fi
+
+        printf 'pane\t%s\t%s\t%s\t%s\t%s\n' \
+            "$pane_active" "$(clean_field "$agent")" "$(clean_field "$pane_cwd")" \
+            "$(clean_field "$scrollback")" "$(clean_field "$command_line")" >>"$TMP_FILE"
+    done < <(tmux -u list-panes -t "$SESSION_NAME:$window_index" \
+        -F $'#{pane_index}\t#{pane_active}\t#{pane_pid}\t#{pane_current_command}\t#{pane_current_path}')
+done < <(tmux -u list-windows -t "$SESSION_NAME" \
+    -F $'#{window_index}\t#{window_active}\t#{window_width}\t#{window_height}\t#{window_layout}')
+
+if [[ $WINDOW_COUNT -eq 0 ]] || [[ $PANE_COUNT -eq 0 ]]; then
+    echo "❌ No windows or panes captured from '$SESSION_NAME'; previous snapshot kept" >&2
+    exit 1
+fi
+
+rm -rf "$SCROLLBACK_DIR"
+if [[ "$SCROLLBACK_LINES" -gt 0 ]]; then
+    mv "$TMP_SCROLLBACK_DIR" "$SCROLLBACK_DIR"
+fi
+mv "$TMP_FILE" "$SNAPSHOT_FILE"
+rm -rf "$TMP_SCROLLBACK_DIR"
+trap - EXIT
+
+echo "📸 Saved $PANE_COUNT panes across $WINDOW_COUNT window(s) from '$SESSION_NAME'"
+echo "   → ${SNAPSHOT_FILE#"$REPO_ROOT/"}"
+echo "💡 Rebuild with: maw restore${CUSTOM_PREFIX:+ --prefix $CUSTOM_PREFIX}${SESSION_OVERRIDE:+ --session $SESSION_OVERRIDE}"
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+
+SCRIPTS_SOURCE = Path(__file__).resolve().parents[1] / "src/multi_agent_kit/assets/.agents/scripts"
+
+
+def _tmux(env: dict[str, str], *args: str) -> str:
+    result = subprocess.run(["tmux", *args], env=env, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def _pane_state(env: dict[str, str], session: str) -> list[str]:
+    output = _tmux(
+        env,
+        "list-panes",
+        "-s",
+        "-t",
+        session,
+        "-F",
+        "#{pane_current_path} #{pane_left},#{pane_top} #{pane_width}x#{pane_height} "
+        "window_active=#{window_active} pane_active=#{pane_active}",
+    )
+    return output.splitlines()
+
+
+def _pane_commands(env: dict[str, str], session: str) -> list[str]:
+    return _tmux(env, "list-panes", "-s", "-t", session, "-F", "#{pane_current_command}").splitlines()
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.1)
+    raise AssertionError("timed out waiting for tmux pane state")
+
+
+def _wait_for_prompt(env: dict[str, str], target: str) -> None:
+    _wait_for(lambda: _tmux(env, "display-message", "-p", "-t", target, "#{cursor_x}").strip() != "0")
+
+
+def _setup_repo(tmp_path: Path) -> tuple[Path, Path, list[Path], dict[str, str]]:
+    repo_root = tmp_path / "demo"
+    script_dir = repo_root / ".agents" / "scripts"
+    script_dir.mkdir(parents=True)
+    for name in ("snapshot.sh", "restore.sh"):
+        target = script_dir / name
+        target.write_bytes((SCRIPTS_SOURCE / name).read_bytes())
+        target.chmod(0o755)
+
+    agent_dirs = [repo_root / "agents" / "1-agent", repo_root / "agents" / "2-agent"]
+    for agent_dir in agent_dirs:
+        agent_dir.mkdir(parents=True)
+
+    socket_dir = tmp_path / "tmux"
+    socket_dir.mkdir()
+    # Run without a UTF-8 locale, as cron/systemd would
+    env = {key: value for key, value in os.environ.items() if key != "LANG" and not key.startswith("LC_")}
+    env.update({"LC_ALL": "C", "TMUX_TMPDIR": str(socket_dir), "SHELL": "/bin/sh", "SESSION_PREFIX": "ai"})
+    env.pop("TMUX", None)
+    return repo_root, script_dir, agent_dirs, env
+
+
+def _pane_records(repo_root: Path, session: str) -> list[list[str]]:
+    snapshot_file = repo_root / ".agents" / "snapshots" / f"{session}.snapshot"
+    records = snapshot_file.read_text().splitlines()
+    return [line.split("\t") for line in records if line.startswith("pane\t")]
+
+
+@pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux is required for snapshot script tests")
+def test_snapshot_and_restore_rebuild_session(tmp_path: Path) -> None:
+    repo_root, script_dir, agent_dirs, env = _setup_repo(tmp_path)
+    session = "ai-demo"
+
+    # Shell metacharacters in argv must survive the retype on restore
+    agent_command = [sys.executable, "-c", "import time; time.sleep(999)", "summarize; touch pwned > notes.md"]
+    agent_name = Path(sys.executable).name
+
+    try:
+        _tmux(env, "new-session", "-d", "-s", session, "-x", "160", "-y", "40", "-c", str(agent_dirs[0]))
+        _tmux(env, "split-window", "-h", "-t", f"{session}:", "-c", str(agent_dirs[1]))
+        _tmux(env, "split-window", "-v", "-t", f"{session}:", "-c", str(repo_root))
+        _tmux(env, "new-window", "-t", f"{session}:", "-c", str(agent_dirs[1]))
+        _tmux(env, "split-window", "-v", "-t", f"{session}:", "-c", str(repo_root))
+
+        first_window = _tmux(env, "list-windows", "-t", session, "-F", "#{window_index}").split()[0]
+        first_panes = _tmux(env, "list-panes", "-t", f"{session}:{first_window}", "-F", "#{pane_id}").split()
+        agent_pane = _tmux(env, "display-message", "-p", "-t", f"{session}:", "#{pane_id}").strip()
+
+        # A background job must not be mistaken for the pane's foreground command
+        _wait_for_prompt(env, agent_pane)
+        _tmux(env, "send-keys", "-t", agent_pane, "sleep 998 &", "Enter")
+        _tmux(env, "send-keys", "-t", agent_pane, "-l", shlex.join(agent_command))
+        _tmux(env, "send-keys", "-t", agent_pane, "Enter")
+        _wait_for(lambda: _tmux(env, "display-message", "-p", "-t", agent_pane, "#{pane_current_command}").strip() == agent_name)
+
+        _wait_for_prompt(env, first_panes[1])
+        _tmux(env, "send-keys", "-t", first_panes[1], "echo scrollback-marker", "Enter")
+        _wait_for(lambda: "scrollback-marker\n" in _tmux(env, "capture-pane", "-p", "-t", first_panes[1]))
+
+        # Leave the first window and its middle pane active rather than the last ones
+        _tmux(env, "select-window", "-t", f"{session}:{first_window}")
+        _tmux(env, "select-pane", "-t", first_panes[1])
+
+        before = _pane_state(env, session)
+        commands_before = _pane_commands(env, session)
+
+        snapshot = subprocess.run(
+            [str(script_dir / "snapshot.sh"), "--scrollback", "50"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert snapshot.returncode == 0, snapshot.stderr
+
+        panes = _pane_records(repo_root, session)
+        assert [pane[2] for pane in panes] == ["1-agent", "2-agent", "root", "2-agent", "root"]
+        assert shlex.split(panes[4][5]) == agent_command
+
+        # Empty rows below the cursor are not kept
+        log_file = repo_root / ".agents" / "snapshots" / session / panes[1][4]
+        assert log_file.read_text().splitlines()[-1].strip()
+
+        _tmux(env, "kill-server")
+
+        restore = subprocess.run(
+            [str(script_dir / "restore.sh"), "--detach"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert restore.returncode == 0, restore.stderr
+        assert _pane_state(env, session) == before
+
+        _wait_for(lambda: _pane_commands(env, session) == commands_before)
+        assert not (repo_root / "notes.md").exists()
+        assert not (repo_root / "pwned").exists()
+
+        restored_first = _tmux(env, "list-windows", "-t", session, "-F", "#{window_index}").split()[0]
+        restored_panes = _tmux(env, "list-panes", "-t", f"{session}:{restored_first}", "-F", "#{pane_id}").split()
+        assert "scrollback-marker" in _tmux(env, "capture-pane", "-p", "-t", restored_panes[1])
+        # $SHELL is expanded by restore.sh, so a fish default-shell can run the command
+        start_command = _tmux(env, "display-message", "-p", "-t", restored_panes[1], "#{pane_start_command}")
+        assert "${SHELL" not in start_command
+        assert "/bin/sh" in start_command
+    finally:
+        subprocess.run(["tmux", "kill-server"], env=env, capture_output=True, check=False)
+
+
+@pytest.mark.skipif(
+    shutil.which("tmux") is None or shutil.which("node") is None,
+    reason="tmux and node are required for process title tests",
+)
+def test_snapshot_saves_name_of_process_that_rewrites_argv(tmp_path: Path) -> None:
+    repo_root, script_dir, agent_dirs, env = _setup_repo(tmp_path)
+    session = "ai-demo"
+
+    # Node CLIs such as claude set process.title, which overwrites argv and pads it with NULs
+    script = tmp_path / "agent.js"
+    script.write_text('process.title = "claude"; setTimeout(() => {}, 999000);\n')
+
+    try:
+        _tmux(env, "new-session", "-d", "-s", session, "-x", "160", "-y", "40", "-c", str(agent_dirs[0]))
+        pane = _tmux(env, "display-message", "-p", "-t", f"{session}:", "#{pane_id}").strip()
+        _wait_for_prompt(env, pane)
+        _tmux(env, "send-keys", "-t", pane, "-l", f"node {shlex.quote(str(script))} --model x")
+        _tmux(env, "send-keys", "-t", pane, "Enter")
+        _wait_for(lambda: _tmux(env, "display-message", "-p", "-t", pane, "#{pane_current_command}").strip() == "claude")
+
+        snapshot = subprocess.run(
+            [str(script_dir / "snapshot.sh")], env=env, capture_output=True, text=True, check=False
+        )
+        assert snapshot.returncode == 0, snapshot.stderr
+
+        assert [pane[5] for pane in _pane_records(repo_root, session)] == ["claude"]
+    finally:
+        subprocess.run(["tmux", "kill-server"], env=env, capture_output=True, check=False)